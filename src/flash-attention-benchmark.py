@@ -167,11 +167,11 @@ def benchmark_impl(
         torch.cuda.synchronize()
         
         # Benchmark
-        start = time.time()
+        start = time.perf_counter_ns()
         for _ in range(iters):
             out = impl_func(q, k, v)
         torch.cuda.synchronize()
-        elapsed = time.time() - start
+        elapsed = (time.perf_counter_ns() - start) / 1e9
         
         avg_time_ms = (elapsed / iters) * 1000
         
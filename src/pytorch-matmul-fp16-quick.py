@@ -4,8 +4,26 @@ Quick PyTorch Matrix Multiplication Benchmark (FP16)
 Testing a few representative shapes
 """
 
+import os
+import statistics
+
+# Ask PyTorch to dispatch GEMMs to hipBLASLt; must be set before torch loads
+os.environ.setdefault('TORCH_BLAS_PREFER_HIPBLASLT', '1')
+
 import torch
-import time
+
+# Optional: Triton matmul baseline
+try:
+    import triton
+    import triton.language as tl
+    TRITON_AVAILABLE = True
+except ImportError:
+    TRITON_AVAILABLE = False
+
+# Allow reduced-precision accumulation in FP16 GEMMs (and TF32 where the
+# hardware has it), so the fastest tensor-core kernels are eligible
+torch.backends.cuda.matmul.allow_fp16_reduced_precision_reduction = True
+torch.backends.cuda.matmul.allow_tf32 = True
 
 print("=" * 70)
 print("PyTorch Matrix Multiplication Benchmark (FP16)")
@@ -20,6 +38,91 @@ print(f"\nDevice: {device}")
 print(f"GPU: {torch.cuda.get_device_name(0)}")
 print(f"PyTorch version: {torch.__version__}")
 
+# Prefer the Lt backend explicitly where this PyTorch exposes the knob
+# ("cublaslt" selects hipBLASLt on ROCm builds)
+if hasattr(torch.backends.cuda, 'preferred_blas_library'):
+    torch.backends.cuda.preferred_blas_library('cublaslt')
+    print(f"BLAS backend: {torch.backends.cuda.preferred_blas_library()}")
+print(f"Triton: {'✅ Available' if TRITON_AVAILABLE else '❌ Not available'}")
+
+if TRITON_AVAILABLE:
+    @triton.autotune(
+        configs=[
+            triton.Config({'BLOCK_M': 128, 'BLOCK_N': 128, 'BLOCK_K': 32}, num_stages=3, num_warps=4),
+            triton.Config({'BLOCK_M': 128, 'BLOCK_N': 128, 'BLOCK_K': 32}, num_stages=3, num_warps=8),
+            triton.Config({'BLOCK_M': 128, 'BLOCK_N': 64, 'BLOCK_K': 32}, num_stages=3, num_warps=4),
+            triton.Config({'BLOCK_M': 64, 'BLOCK_N': 128, 'BLOCK_K': 32}, num_stages=3, num_warps=4),
+            triton.Config({'BLOCK_M': 64, 'BLOCK_N': 64, 'BLOCK_K': 32}, num_stages=3, num_warps=4),
+        ],
+        key=['M', 'N', 'K'],
+    )
+    @triton.jit
+    def matmul_kernel(A, B, C, M, N, K,
+                      stride_am, stride_ak, stride_bk, stride_bn, stride_cm, stride_cn,
+                      BLOCK_M: tl.constexpr, BLOCK_N: tl.constexpr, BLOCK_K: tl.constexpr):
+        # One BLOCK_M x BLOCK_N tile of C per program
+        pid_m = tl.program_id(0)
+        pid_n = tl.program_id(1)
+        offs_m = pid_m * BLOCK_M + tl.arange(0, BLOCK_M)
+        offs_n = pid_n * BLOCK_N + tl.arange(0, BLOCK_N)
+        offs_k = tl.arange(0, BLOCK_K)
+        a_ptrs = A + offs_m[:, None] * stride_am + offs_k[None, :] * stride_ak
+        b_ptrs = B + offs_k[:, None] * stride_bk + offs_n[None, :] * stride_bn
+
+        # Accumulate in FP32 on the matrix cores (tl.dot)
+        acc = tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32)
+        for k0 in range(0, K, BLOCK_K):
+            a = tl.load(a_ptrs, mask=(offs_m[:, None] < M) & (offs_k[None, :] + k0 < K), other=0.0)
+            b = tl.load(b_ptrs, mask=(offs_k[:, None] + k0 < K) & (offs_n[None, :] < N), other=0.0)
+            acc = tl.dot(a, b, acc)
+            a_ptrs += BLOCK_K * stride_ak
+            b_ptrs += BLOCK_K * stride_bk
+
+        c_ptrs = C + offs_m[:, None] * stride_cm + offs_n[None, :] * stride_cn
+        tl.store(c_ptrs, acc.to(tl.float16), mask=(offs_m[:, None] < M) & (offs_n[None, :] < N))
+
+    def matmul_triton(A, B):
+        """C = A @ B with the autotuned Triton kernel"""
+        M, K = A.shape
+        _, N = B.shape
+        C = torch.empty((M, N), device=A.device, dtype=A.dtype)
+        grid = lambda meta: (triton.cdiv(M, meta['BLOCK_M']), triton.cdiv(N, meta['BLOCK_N']))
+        matmul_kernel[grid](A, B, C, M, N, K,
+                            A.stride(0), A.stride(1), B.stride(0), B.stride(1), C.stride(0), C.stride(1))
+        return C
+
+def time_graph_samples_ms(matmul, A, B, iterations=10):
+    """Per-replay GPU times in ms of matmul(A, B), replayed from a captured
+    CUDA/HIP graph. One extra replay is run and its sample dropped, since the
+    first launch after warmup can still pay one-off costs. Of the rest, the
+    median gives the typical rate and the min the closest estimate of
+    steady-state peak"""
+    # Warmup on a side stream, as required before graph capture (this is
+    # also where Triton runs its autotuning)
+    warmup_stream = torch.cuda.Stream()
+    warmup_stream.wait_stream(torch.cuda.current_stream())
+    with torch.cuda.stream(warmup_stream):
+        for _ in range(3):
+            _ = matmul(A, B)
+    torch.cuda.current_stream().wait_stream(warmup_stream)
+
+    # Capture one matmul into a CUDA/HIP graph; replaying it skips the
+    # Python -> ATen -> hipLaunchKernel path on every iteration
+    graph = torch.cuda.CUDAGraph()
+    with torch.cuda.graph(graph):
+        C = matmul(A, B)
+
+    # Benchmark, timed per replay on the GPU with CUDA/HIP events
+    events = [torch.cuda.Event(enable_timing=True) for _ in range(iterations + 2)]
+    for event in events[:-1]:
+        event.record()
+        graph.replay()
+    events[-1].record()
+    events[-1].synchronize()
+
+    times = [start.elapsed_time(stop) for start, stop in zip(events, events[1:])]
+    return times[1:]
+
 # Test a few representative shapes
 test_cases = [
     (1024, 1024, 1024),
@@ -42,40 +145,115 @@ for i, (m, n, k) in enumerate(test_cases, 1):
     A = torch.randn(m, k, device=device, dtype=torch.float16)
     B = torch.randn(k, n, device=device, dtype=torch.float16)
 
-    # Warmup
+    times = time_graph_samples_ms(torch.mm, A, B)
+    median_time = statistics.median(times) / 1000  # ms -> s
+    min_time = min(times) / 1000
+
+    # Calculate TOPS (Tera Operations Per Second)
+    # Matrix multiplication: 2*m*n*k operations
+    tops = (2 * m * n * k) / (median_time * 1e12)
+    peak_tops = (2 * m * n * k) / (min_time * 1e12)
+
+    print(f"  Time: {median_time*1000:.2f} ms median, {min_time*1000:.2f} ms min, "
+          f"Performance: {tops:.2f} TOPS (peak {peak_tops:.2f})")
+
+    result = {
+        'm': m,
+        'n': n,
+        'k': k,
+        'time_ms': median_time * 1000,
+        'min_time_ms': min_time * 1000,
+        'tops': tops,
+        'peak_tops': peak_tops
+    }
+
+    # Same shape through the Triton kernel; ratio > 1 means torch.mm is faster
+    if TRITON_AVAILABLE:
+        triton_time = statistics.median(time_graph_samples_ms(matmul_triton, A, B)) / 1000
+        triton_tops = (2 * m * n * k) / (triton_time * 1e12)
+        result['triton_time_ms'] = triton_time * 1000
+        result['triton_tops'] = triton_tops
+        print(f"  Triton: {triton_time*1000:.2f} ms median, Performance: {triton_tops:.2f} TOPS "
+              f"(torch/triton: {triton_time / median_time:.2f}x)")
+
+    results.append(result)
+
+def time_direct_samples_ms(matmul, A, B, iterations=10):
+    """Per-call GPU times in ms of matmul(A, B) launched directly, without a
+    graph, so each call keeps its Python and per-launch dispatch cost. One
+    extra call is run and its sample dropped, as in time_graph_samples_ms"""
     for _ in range(3):
-        _ = torch.mm(A, B)
+        _ = matmul(A, B)
 
-    torch.cuda.synchronize()
+    events = [torch.cuda.Event(enable_timing=True) for _ in range(iterations + 2)]
+    for event in events[:-1]:
+        event.record()
+        _ = matmul(A, B)
+    events[-1].record()
+    events[-1].synchronize()
 
-    # Benchmark
-    iterations = 10
-    start = time.time()
-    for _ in range(iterations):
-        C = torch.mm(A, B)
+    times = [start.elapsed_time(stop) for start, stop in zip(events, events[1:])]
+    return times[1:]
 
-    torch.cuda.synchronize()
+def looped_mm(A, B):
+    """(batch, m, k) @ (batch, k, n) as one torch.mm per batch entry"""
+    C = torch.empty(A.shape[0], A.shape[1], B.shape[2], device=A.device, dtype=A.dtype)
+    for j in range(A.shape[0]):
+        torch.mm(A[j], B[j], out=C[j])
+    return C
 
-    elapsed = time.time() - start
-    avg_time = elapsed / iterations
+# Batched 3D matmuls, as in attention and MoE layers: one torch.bmm (a single
+# batched hipBLASLt call) vs. a loop of 2D torch.mm over the same data. The
+# loop is launched directly, not replayed from a graph, since its per-call
+# launch overhead is exactly what batching removes
+batched_cases = [
+    (1024, 1024, 1024, 32),
+    (2048, 2048, 2048, 8),
+]
 
-    # Calculate TOPS (Tera Operations Per Second)
-    # Matrix multiplication: 2*m*n*k operations
-    tops = (2 * m * n * k) / (avg_time * 1e12)
+print("\n" + "=" * 70)
+print("Starting batched benchmark...")
+print("=" * 70)
+
+batched_results = []
+
+for i, (m, n, k, batch) in enumerate(batched_cases, 1):
+    print(f"\n[{i}/{len(batched_cases)}] Testing {batch} x (m={m}, n={n}, k={k})...")
+
+    A = torch.randn(batch, m, k, device=device, dtype=torch.float16)
+    B = torch.randn(batch, k, n, device=device, dtype=torch.float16)
+
+    batched_time = statistics.median(time_graph_samples_ms(torch.bmm, A, B)) / 1000
+    looped_time = statistics.median(time_direct_samples_ms(looped_mm, A, B)) / 1000
+
+    batched_tops = (2 * batch * m * n * k) / (batched_time * 1e12)
+    looped_tops = (2 * batch * m * n * k) / (looped_time * 1e12)
 
-    print(f"  Time: {avg_time*1000:.2f} ms, Performance: {tops:.2f} TOPS")
+    print(f"  Batched: {batched_time*1000:.2f} ms ({batched_tops:.2f} TOPS)")
+    print(f"  Looped:  {looped_time*1000:.2f} ms ({looped_tops:.2f} TOPS)")
 
-    results.append({
+    batched_results.append({
         'm': m,
         'n': n,
         'k': k,
-        'time_ms': avg_time * 1000,
-        'tops': tops
+        'batch': batch,
+        'batched_time_ms': batched_time * 1000,
+        'looped_time_ms': looped_time * 1000,
+        'batched_tops': batched_tops,
+        'looped_tops': looped_tops
     })
 
 print("\n" + "=" * 70)
-print("Results Summary:")
+print("Results Summary (median, peak from min):")
 print("=" * 70)
 for r in results:
-    print(f"  ({r['m']}, {r['n']}, {r['k']}): {r['time_ms']:.2f} ms ({r['tops']:.2f} TOPS)")
+    line = f"  ({r['m']}, {r['n']}, {r['k']}): {r['time_ms']:.2f} ms ({r['tops']:.2f} TOPS, peak {r['peak_tops']:.2f})"
+    if 'triton_tops' in r:
+        line += f", Triton {r['triton_tops']:.2f} TOPS (torch/triton: {r['tops'] / r['triton_tops']:.2f}x)"
+    print(line)
+print("\nBatched (bmm vs. looped mm):")
+for r in batched_results:
+    print(f"  ({r['m']}, {r['n']}, {r['k']}) x {r['batch']}: "
+          f"{r['batched_tops']:.2f} vs {r['looped_tops']:.2f} TOPS "
+          f"({r['looped_time_ms'] / r['batched_time_ms']:.2f}x)")
 print("=" * 70)
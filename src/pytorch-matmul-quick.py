@@ -4,8 +4,8 @@ Quick PyTorch Matrix Multiplication Benchmark (BF16)
 Testing a few representative shapes
 """
 
+import statistics
 import torch
-import time
 
 print("=" * 70)
 print("PyTorch Matrix Multiplication Benchmark (BF16)")
@@ -42,40 +42,57 @@ for i, (m, n, k) in enumerate(test_cases, 1):
     A = torch.randn(m, k, device=device, dtype=torch.bfloat16)
     B = torch.randn(k, n, device=device, dtype=torch.bfloat16)
 
-    # Warmup
-    for _ in range(3):
-        _ = torch.mm(A, B)
-
-    torch.cuda.synchronize()
-
-    # Benchmark
-    iterations = 10
-    start = time.time()
-    for _ in range(iterations):
+    # Warmup on a side stream, as required before graph capture
+    warmup_stream = torch.cuda.Stream()
+    warmup_stream.wait_stream(torch.cuda.current_stream())
+    with torch.cuda.stream(warmup_stream):
+        for _ in range(3):
+            _ = torch.mm(A, B)
+    torch.cuda.current_stream().wait_stream(warmup_stream)
+
+    # Capture one matmul into a CUDA/HIP graph; replaying it skips the
+    # Python -> ATen -> hipLaunchKernel path on every iteration
+    graph = torch.cuda.CUDAGraph()
+    with torch.cuda.graph(graph):
         C = torch.mm(A, B)
 
-    torch.cuda.synchronize()
+    # Benchmark, timed per replay on the GPU with CUDA/HIP events. One extra
+    # replay is run and its sample dropped, since the first launch after
+    # warmup can still pay one-off costs. Of the rest, the median gives the
+    # typical rate and the min the closest estimate of steady-state peak
+    iterations = 10
+    events = [torch.cuda.Event(enable_timing=True) for _ in range(iterations + 2)]
+    for event in events[:-1]:
+        event.record()
+        graph.replay()
+    events[-1].record()
+    events[-1].synchronize()
 
-    elapsed = time.time() - start
-    avg_time = elapsed / iterations
+    times = [start.elapsed_time(stop) for start, stop in zip(events, events[1:])][1:]
+    median_time = statistics.median(times) / 1000  # ms -> s
+    min_time = min(times) / 1000
 
     # Calculate TOPS (Tera Operations Per Second)
     # Matrix multiplication: 2*m*n*k operations
-    tops = (2 * m * n * k) / (avg_time * 1e12)
+    tops = (2 * m * n * k) / (median_time * 1e12)
+    peak_tops = (2 * m * n * k) / (min_time * 1e12)
 
-    print(f"  Time: {avg_time*1000:.2f} ms, Performance: {tops:.2f} TOPS")
+    print(f"  Time: {median_time*1000:.2f} ms median, {min_time*1000:.2f} ms min, "
+          f"Performance: {tops:.2f} TOPS (peak {peak_tops:.2f})")
 
     results.append({
         'm': m,
         'n': n,
         'k': k,
-        'time_ms': avg_time * 1000,
-        'tops': tops
+        'time_ms': median_time * 1000,
+        'min_time_ms': min_time * 1000,
+        'tops': tops,
+        'peak_tops': peak_tops
     })
 
 print("\n" + "=" * 70)
-print("Results Summary:")
+print("Results Summary (median, peak from min):")
 print("=" * 70)
 for r in results:
-    print(f"  ({r['m']}, {r['n']}, {r['k']}): {r['time_ms']:.2f} ms ({r['tops']:.2f} TOPS)")
+    print(f"  ({r['m']}, {r['n']}, {r['k']}): {r['time_ms']:.2f} ms ({r['tops']:.2f} TOPS, peak {r['peak_tops']:.2f})")
 print("=" * 70)
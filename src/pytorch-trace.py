@@ -3,6 +3,15 @@
 Trace PyTorch matrix multiplication to see actual kernel calls
 """
 
+import os
+
+# HIP and the BLAS libraries read their logging knobs once, when they are
+# loaded, so they must be set before torch initializes the GPU
+os.environ.setdefault('HIP_TRACE_API', '1')        # log every HIP API call
+os.environ.setdefault('AMD_LOG_LEVEL', '4')        # HIP runtime debug log, incl. kernel names
+os.environ.setdefault('HIPBLASLT_LOG_LEVEL', '5')  # hipBLASLt API trace
+os.environ.setdefault('ROCBLAS_LAYER', '6')        # rocBLAS bench + profile logging
+
 import torch
 import subprocess
 
@@ -23,15 +32,10 @@ for _ in range(3):
     _ = torch.mm(A, B)
 torch.cuda.synchronize()
 
-# Use ROCTRACER to see actual kernel calls
-print("\nAttempting to trace HIP kernels...")
+# The runtime and library logs (on stderr) show the actual kernel calls
+print("\nTracing HIP kernels...")
 print("This will show if PyTorch is using hipBLAS, hipBLASLt, or something else\n")
 
-# Simple trace
-import os
-os.environ['HIP_TRACE_API'] = '1'
-os.environ['AMD_LOG_LEVEL'] = '4'
-
 # Do a single matmul
 result = torch.mm(A, B)
 torch.cuda.synchronize()
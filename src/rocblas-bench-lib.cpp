@@ -0,0 +1,167 @@
+// rocBLAS GEMM timing entry point for the Python benchmarks
+// Built as librocblas-bench.so (the library counterpart of the standalone
+// rocblas-bench tool); the whole timed loop runs in C++, so Python pays one
+// ctypes call per shape instead of one per GEMM
+
+#include <hip/hip_runtime.h>
+#include <rocblas/rocblas.h>
+#include <iostream>
+#include <vector>
+#include <cstdlib>
+#include <algorithm>
+
+#define HIP_CHECK(call) \
+    do { \
+        hipError_t err = call; \
+        if (err != hipSuccess) { \
+            std::cerr << "HIP Error: " << hipGetErrorString(err) \
+                      << " at " << __FILE__ << ":" << __LINE__ << std::endl; \
+            return -1.0; \
+        } \
+    } while(0)
+
+#define ROCBLAS_CHECK(call) \
+    do { \
+        rocblas_status status = call; \
+        if (status != rocblas_status_success) { \
+            std::cerr << "rocBLAS Error: " << rocblas_status_to_string(status) \
+                      << " at " << __FILE__ << ":" << __LINE__ << std::endl; \
+            return -1.0; \
+        } \
+    } while(0)
+
+// Handle and stream are created on first use and reused by every call
+static rocblas_handle handle = nullptr;
+static hipStream_t stream = nullptr;
+
+// Device buffers and events of one run_gemm call, released on every return path
+struct GemmResources {
+    void *d_A = nullptr, *d_B = nullptr, *d_C = nullptr;
+    std::vector<hipEvent_t> events;
+
+    ~GemmResources() {
+        for (hipEvent_t event : events) {
+            hipEventDestroy(event);
+        }
+        hipFree(d_A);
+        hipFree(d_B);
+        hipFree(d_C);
+    }
+};
+
+template<typename T>
+static double run_gemm(int m, int n, int k, int iters, rocblas_datatype data_type) {
+    size_t size_A = static_cast<size_t>(m) * k;
+    size_t size_B = static_cast<size_t>(k) * n;
+    size_t size_C = static_cast<size_t>(m) * n;
+
+    // Random inputs in [0, 1)
+    std::vector<T> h_A(size_A);
+    std::vector<T> h_B(size_B);
+    for (size_t i = 0; i < h_A.size(); i++) {
+        h_A[i] = static_cast<T>(static_cast<float>(rand()) / RAND_MAX);
+    }
+    for (size_t i = 0; i < h_B.size(); i++) {
+        h_B[i] = static_cast<T>(static_cast<float>(rand()) / RAND_MAX);
+    }
+
+    GemmResources res;
+    HIP_CHECK(hipMalloc(&res.d_A, size_A * sizeof(T)));
+    HIP_CHECK(hipMalloc(&res.d_B, size_B * sizeof(T)));
+    HIP_CHECK(hipMalloc(&res.d_C, size_C * sizeof(T)));
+    HIP_CHECK(hipMemcpyAsync(res.d_A, h_A.data(), size_A * sizeof(T), hipMemcpyHostToDevice, stream));
+    HIP_CHECK(hipMemcpyAsync(res.d_B, h_B.data(), size_B * sizeof(T), hipMemcpyHostToDevice, stream));
+
+    float alpha = 1.0f;
+    float beta = 0.0f;
+
+    auto gemm = [&]() {
+        return rocblas_gemm_ex(
+            handle,
+            rocblas_operation_none, rocblas_operation_none,
+            m, n, k,
+            &alpha,
+            res.d_A, data_type, m,
+            res.d_B, data_type, k,
+            &beta,
+            res.d_C, data_type, m,
+            res.d_C, data_type, m,
+            rocblas_datatype_f32_r,  // compute type
+            rocblas_gemm_algo_standard,
+            0, 0
+        );
+    };
+
+    // Warmup
+    for (int i = 0; i < 3; i++) {
+        ROCBLAS_CHECK(gemm());
+    }
+
+    // Benchmark, timed per call on the GPU: an event before each call and
+    // after the last. The first sample is dropped, as in the Python helpers
+    int samples = iters + 1;
+    for (int i = 0; i <= samples; i++) {
+        hipEvent_t event;
+        HIP_CHECK(hipEventCreate(&event));
+        res.events.push_back(event);
+    }
+
+    for (int i = 0; i < samples; i++) {
+        HIP_CHECK(hipEventRecord(res.events[i], stream));
+        ROCBLAS_CHECK(gemm());
+    }
+    HIP_CHECK(hipEventRecord(res.events[samples], stream));
+    HIP_CHECK(hipEventSynchronize(res.events[samples]));
+
+    std::vector<float> times;
+    for (int i = 1; i < samples; i++) {
+        float elapsed_ms;
+        HIP_CHECK(hipEventElapsedTime(&elapsed_ms, res.events[i], res.events[i + 1]));
+        times.push_back(elapsed_ms);
+    }
+
+    // Median of the kept samples
+    std::sort(times.begin(), times.end());
+    size_t mid = times.size() / 2;
+    double median_ms = times.size() % 2 ? times[mid] : 0.5 * (times[mid - 1] + times[mid]);
+    return median_ms;
+}
+
+extern "C" {
+
+// Median time in ms of one m x n x k rocblas_gemm_ex over `iters` calls (after
+// one discarded call). dtype is a rocblas_datatype (f16_r or bf16_r); returns
+// a negative value on error.
+double bench_gemm(int m, int n, int k, int iters, int dtype) {
+    if (iters < 1) {
+        std::cerr << "bench_gemm: iters must be at least 1" << std::endl;
+        return -1.0;
+    }
+    if (handle == nullptr) {
+        HIP_CHECK(hipStreamCreate(&stream));
+        ROCBLAS_CHECK(rocblas_create_handle(&handle));
+        ROCBLAS_CHECK(rocblas_set_stream(handle, stream));
+    }
+
+    switch (static_cast<rocblas_datatype>(dtype)) {
+        case rocblas_datatype_f16_r:
+            return run_gemm<_Float16>(m, n, k, iters, rocblas_datatype_f16_r);
+        case rocblas_datatype_bf16_r:
+            return run_gemm<rocblas_bfloat16>(m, n, k, iters, rocblas_datatype_bf16_r);
+        default:
+            std::cerr << "bench_gemm: unsupported dtype " << dtype << std::endl;
+            return -1.0;
+    }
+}
+
+// Release the handle and stream created by bench_gemm
+void bench_shutdown(void) {
+    if (handle != nullptr) {
+        rocblas_destroy_handle(handle);
+        hipStreamDestroy(stream);
+        handle = nullptr;
+        stream = nullptr;
+    }
+}
+
+}